@@ -0,0 +1,55 @@
+import t from 'tap'
+import fs from 'fs/promises'
+import path from 'path'
+import os from 'os'
+
+import { symlink } from './symlink.js'
+
+const getSimpleDate = () => new Date().toISOString().replace(/[-:]/g, '').replace('T', '-').substring(4, 15)
+
+const baseTestDir = path.join(os.tmpdir(), 'gallery-test', 'bundle-symlink', `run-${getSimpleDate()}`)
+
+t.test('symlink', async t => {
+  await fs.mkdir(baseTestDir, {recursive: true})
+
+  t.test('creates relative link', async t => {
+    const dir = path.join(baseTestDir, 'create')
+    const file = path.join(dir, 'file.txt')
+    const link = path.join(dir, 'latest', 'file.txt')
+    await fs.mkdir(dir, {recursive: true})
+    await fs.writeFile(file, 'data')
+
+    await symlink(file, link)
+
+    t.same(await fs.readlink(link), path.join('..', 'file.txt'))
+    t.same(await fs.readFile(link, 'utf8'), 'data')
+  })
+
+  t.test('replaces dangling link', async t => {
+    const dir = path.join(baseTestDir, 'dangling')
+    const file = path.join(dir, 'file.txt')
+    const link = path.join(dir, 'latest')
+    await fs.mkdir(dir, {recursive: true})
+    await fs.writeFile(file, 'data')
+    await fs.symlink('missing.txt', link)
+
+    await symlink(file, link)
+
+    t.same(await fs.readlink(link), 'file.txt')
+    t.same((await fs.readdir(dir)).sort(), ['file.txt', 'latest'], 'should not leave temporary link')
+  })
+
+  t.test('ignores leftover temporary link', async t => {
+    const dir = path.join(baseTestDir, 'leftover')
+    const file = path.join(dir, 'file.txt')
+    const link = path.join(dir, 'latest')
+    await fs.mkdir(dir, {recursive: true})
+    await fs.writeFile(file, 'data')
+    await fs.symlink('old.txt', `${link}.tmp${process.pid}`)
+
+    await symlink(file, link)
+
+    t.same(await fs.readlink(link), 'file.txt')
+    t.same((await fs.readdir(dir)).sort(), ['file.txt', 'latest'], 'should remove leftover temporary link')
+  })
+})
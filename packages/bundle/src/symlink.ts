@@ -3,7 +3,14 @@ import path from 'path'
 
 export const symlink = async (file: string, link: string) => {
   await fs.mkdir(path.dirname(link), {recursive: true})
-  await fs.access(link).then(() => fs.unlink(link)).catch(() => true)
   const relativeFile = path.relative(path.dirname(link), file)
-  return fs.symlink(relativeFile, link)
-}
\ No newline at end of file
+  // Create link aside and rename it to replace an existing (or dangling) link atomically
+  const tmpLink = `${link}.tmp${process.pid}`
+  // Remove a leftover of a crashed run with the same (reused) pid
+  await fs.unlink(tmpLink).catch(() => true)
+  await fs.symlink(relativeFile, tmpLink)
+  return fs.rename(tmpLink, link).catch(async err => {
+    await fs.unlink(tmpLink).catch(() => true)
+    throw err
+  })
+}
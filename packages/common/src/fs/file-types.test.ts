@@ -0,0 +1,25 @@
+import t from 'tap'
+
+import { getFileTypeByExtension } from './file-types.js'
+
+t.test('getFileTypeByExtension', async t => {
+  t.test('basic', async t => {
+    t.same(getFileTypeByExtension('IMG_1234.jpg'), 'image')
+    t.same(getFileTypeByExtension('VID_1234.mp4'), 'video')
+    t.same(getFileTypeByExtension('IMG_1234.xmp'), 'meta')
+  })
+
+  t.test('ignores case', async t => {
+    t.same(getFileTypeByExtension('IMG_1234.JPG'), 'image')
+  })
+
+  t.test('first type wins for extensions of multiple types', async t => {
+    t.same(getFileTypeByExtension('notes.txt'), 'text')
+    t.same(getFileTypeByExtension('README.md'), 'text')
+  })
+
+  t.test('unknown', async t => {
+    t.same(getFileTypeByExtension('foo.xyz'), 'unknown')
+    t.same(getFileTypeByExtension('noext'), 'unknown')
+  })
+})
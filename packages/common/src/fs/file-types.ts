@@ -12,20 +12,21 @@ export const fileTypes = {
   bin: 'exe,dll'.split(',')
 }
 
+const extensionToType = Object.keys(fileTypes).reduce((result, type) => {
+  fileTypes[type].forEach(ext => {
+    // First type wins for extensions of multiple types like txt or md
+    if (!result.has(ext)) {
+      result.set(ext, type)
+    }
+  })
+  return result
+}, new Map<string, string>())
+
 export function getFileTypeByExtension(filename) {
   const match = filename.match(/\.(\w{2,4})$/);
   if (!match) {
     return 'unknown';
   }
   const ext = match[1].toLowerCase();
-  const types = Object.keys(fileTypes);
-  for (let i = 0; i < types.length; i++) {
-    const type = types[i];
-    const extensions = fileTypes[type];
-    if (extensions.indexOf(ext) >= 0) {
-      return type;
-    }
-  }
-  return 'unknown';
+  return extensionToType.get(ext) || 'unknown';
 }
-
@@ -3,6 +3,7 @@ import { createWriteStream } from 'fs'
 import path from 'path'
 import { pipeline } from 'stream/promises'
 import fetch from 'node-fetch'
+import http from 'http';
 import https from 'https';
 
 import { migrate } from '@home-gallery/database'
@@ -14,17 +15,51 @@ const log = Logger('fetch.api')
 
 import { EventSource } from './event-source.js'
 
+// Reuse connections for the many preview file requests. Without an agent
+// node-fetch sends 'Connection: close' and each request needs a new
+// TCP (and TLS) handshake
+const httpAgent = new http.Agent({
+  keepAlive: true,
+});
+
+const httpsAgent = new https.Agent({
+  keepAlive: true,
+});
+
 const insecureAgent = new https.Agent({
+  keepAlive: true,
   rejectUnauthorized: false,
 });
 
-const options = (remote) => {
-  if (remote.url.startsWith('https') && remote.insecure) {
-    return {
-      agent: insecureAgent
-    }
+// node-fetch keeps the agent on redirects. Select it by the protocol of the
+// requested url so redirects from http to https and vice versa still work
+const fetchOptions = {
+  agent: url => url.protocol == 'http:' ? httpAgent : httpsAgent
+}
+const insecureFetchOptions = {
+  agent: url => url.protocol == 'http:' ? httpAgent : insecureAgent
+}
+
+const options = (remote) => remote.insecure ? insecureFetchOptions : fetchOptions
+
+// The event source uses http.get() directly, which does not follow redirects
+// and requires an agent object of the url's protocol
+const httpOptions = { agent: httpAgent }
+const httpsOptions = { agent: httpsAgent }
+const insecureOptions = { agent: insecureAgent }
+
+const eventSourceOptions = (remote) => {
+  if (!remote.url.startsWith('https')) {
+    return httpOptions
+  } else if (remote.insecure) {
+    return insecureOptions
   }
-  return {}
+  return httpsOptions
+}
+
+// Drain an unused response body so its keep-alive socket is released
+const discardBody = (res) => {
+  res.body?.resume()
 }
 
 const createIncompatibleError = (data, expectedType) => {
@@ -49,9 +84,11 @@ export const fetchDatabase = async (remote) => {
   return fetch(`${remote.url}/api/database.json${query ? `?q=${query}` : ''}`, options(remote))
     .then(res => {
       if (res.status == 404) {
+        discardBody(res)
         log.debug(t0, `Remote ${remote.url} has no database. Continue with empty database`)
         return { type: EventHeaderType, data: [] }
       } else if (!res.ok) {
+        discardBody(res)
         throw new Error(`Unexpected response status ${res.status}`)
       }
       return res.json()
@@ -69,9 +106,11 @@ export const fetchEvents = async (remote) => {
   return fetch(`${remote.url}/api/events.json`, options(remote))
     .then(res => {
       if (res.status == 404) {
+        discardBody(res)
         log.debug(t0, `Remote has no events. Continue with empty events`)
         return { type: EventHeaderType, data: [] }
       } else if (!res.ok) {
+        discardBody(res)
         throw new Error(`Unexpected response status ${res.status}`)
       }
       return res.json()
@@ -84,17 +123,28 @@ export const fetchEvents = async (remote) => {
     })
 }
 
-export const fetchFile = async (remote, file, storageDir) => {
+/**
+ * @param {import('./types.js').Remote} remote
+ * @param {string} file
+ * @param {string} storageDir
+ * @param {Set<string>} [createdDirs] Directories already created in the same fetch run.
+ *   Storage directories are shared by many preview files
+ */
+export const fetchFile = async (remote, file, storageDir, createdDirs = new Set()) => {
   log.trace(`Fetching ${file} from remote ${remote.url}...`)
   const targetFilename = path.join(storageDir, file)
   const dir = path.dirname(targetFilename)
-  await fs.access(dir).then(() => true).catch(() => fs.mkdir(dir, {recursive: true}))
+  if (!createdDirs.has(dir)) {
+    await fs.mkdir(dir, {recursive: true})
+    createdDirs.add(dir)
+  }
 
   const url = `${remote.url}/files/${file}`
   const t0 = Date.now()
   return fetch(url, options(remote))
     .then(res => {
       if (!res.ok) {
+        discardBody(res)
         throw new Error(`HTTP status code is ${res.status} for ${url}`)
       }
       return res
@@ -108,7 +158,7 @@ export const fetchFile = async (remote, file, storageDir) => {
 }
 
 export const connectEventStream = (remote, onEvent) => {
-  const source = new EventSource(`${remote.url}/api/events/stream`, options(remote))
+  const source = new EventSource(`${remote.url}/api/events/stream`, eventSourceOptions(remote))
   let stopped = false
   let retries = 0
   let timer = false
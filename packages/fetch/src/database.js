@@ -162,23 +162,24 @@ const createDownloadAllStream = (remoteDatabase, storageDir, remote) => {
   }
 
   const indices = getEntryIndices(remoteDatabase.data)
-  const entryIds = remoteDatabase.data.map(entry => entry.id)
+  const entryIds = new Set(remoteDatabase.data.map(entry => entry.id))
+  const createdDirs = new Set()
 
   const downloadPreviews = async (entry) => {
     await Promise.allSettled(entry.previews.map(preview => {
       if (remote.forceDownload) {
-        return fetchFile(remote, preview, storageDir)
+        return fetchFile(remote, preview, storageDir, createdDirs)
       }
       const localFile = path.resolve(storageDir, preview)
       return access(localFile).catch(() => {
-        return fetchFile(remote, preview, storageDir)
+        return fetchFile(remote, preview, storageDir, createdDirs)
       })
     }))
   }
 
   return through(function(entry, enc, cb) {
     const firstFile = entry.files[0]
-    if (!indices.includes(firstFile.index) || entryIds.includes(entry.id)) {
+    if (!indices.includes(firstFile.index) || entryIds.has(entry.id)) {
       return cb(null, entry)
     }
 
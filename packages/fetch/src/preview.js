@@ -1,4 +1,3 @@
-import fs from 'fs'
 import { access } from 'fs/promises'
 import path from 'path'
 import { Readable } from 'stream'
@@ -28,17 +27,17 @@ const getPreviewFiles = (remoteDatabase) => {
 /**
  * @param {string[]} previewFiles
  * @param {string} storageDir
+ * @param {number} [concurrent] Count of parallel file checks
  * @returns {Promise<string[]>}
  */
-const collectMissingPreviewFiles = async (previewFiles, storageDir) => {
+const collectMissingPreviewFiles = async (previewFiles, storageDir, concurrent = 64) => {
   const missingFiles = []
 
   const t0 = Date.now()
-  for (let file of previewFiles) {
-    const missing = await access(path.resolve(storageDir, file)).then(() => false, () => true)
-    if (missing) {
-      missingFiles.push(file)
-    }
+  for (let i = 0; i < previewFiles.length; i += concurrent) {
+    const files = previewFiles.slice(i, i + concurrent)
+    const missing = await Promise.all(files.map(file => access(path.resolve(storageDir, file)).then(() => false, () => true)))
+    files.forEach((file, j) => missing[j] && missingFiles.push(file))
   }
   log.trace(t0, `Found ${missingFiles.length} missing from total ${previewFiles.length} remote preview files`)
 
@@ -56,21 +55,9 @@ const downloadPreviewFiles = async (remote, previewFiles, storageDir) => {
   }
 
   let fetchFileCount = 0
+  const createdDirs = new Set()
 
-  const test = (file, cb) => {
-    if (remote.forceDownload) {
-      return cb(true)
-    }
-    fs.access(path.join(storageDir, file), (fs.constants || fs).F_OK, err => {
-      if (err) {
-        return cb(true)
-      }
-      log.trace(`Skip downloading existing file ${file}`)
-      return cb(false)
-    })
-  }
-
-  const task = (file, cb) => fetchFile(remote, file, storageDir)
+  const task = (file, cb) => fetchFile(remote, file, storageDir, createdDirs)
     .then(() => {
       fetchFileCount++
       cb()
@@ -84,7 +71,7 @@ const downloadPreviewFiles = async (remote, previewFiles, storageDir) => {
   const t0 = Date.now()
   await pipeline(
     Readable.from(previewFiles),
-    parallel({ test, task, concurrent: 10 }),
+    parallel({ task, concurrent: 10 }),
     purge(),
   )
   log.info(t0, `Fetched ${fetchFileCount} files from remote ${remote.url}`)
@@ -60,8 +60,8 @@ function getFileEntriesForChecksum(updatedEntries: IIndexEntry[], changes: IInde
     ...changes.changes.filter(e => e.isFile),
   ]
 
-  const journalFilenames = journalFileEntries.map(e => e.filename)
-  const addChecksumEntries = fileEntries.filter(e => !e.sha1sum && !journalFilenames.includes(e.filename))
+  const journalFilenames = new Set(journalFileEntries.map(e => e.filename))
+  const addChecksumEntries = fileEntries.filter(e => !e.sha1sum && !journalFilenames.has(e.filename))
 
   journalFileEntries.push(...addChecksumEntries)
   return journalFileEntries
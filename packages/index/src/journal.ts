@@ -50,13 +50,10 @@ function toDirReducer(result: Record<string, IIndexEntry[]>, entry: IIndexEntry)
   return result
 }
 
-function getChangeType(journal: IIndexChanges, filename: string): 'added' | 'changed' | 'removed' {
-  let entry = journal.changes.find(entry => entry.filename == filename)
-  if (entry) {
+function getChangeType(changedFilenames: Set<string>, addedFilenames: Set<string>, filename: string): 'added' | 'changed' | 'removed' {
+  if (changedFilenames.has(filename)) {
     return 'changed'
-  }
-  entry = journal.adds.find(entry => entry.filename == filename)
-  if (entry) {
+  } else if (addedFilenames.has(filename)) {
     return 'added'
   } else {
     return 'removed'
@@ -72,7 +69,9 @@ function addChangesForSidecars(entries: IIndexEntry[], changes: IIndexChanges) {
   changes.changes.reduce(toDirReducer, dir2journalEntries)
   changes.removes.reduce(toDirReducer, dir2journalEntries)
 
-  const removedFilenames = changes.removes.map(entry => entry.filename)
+  const removedFilenames = new Set(changes.removes.map(entry => entry.filename))
+  const changedFilenames = new Set(changes.changes.map(entry => entry.filename))
+  const addedFilenames = new Set(changes.adds.map(entry => entry.filename))
 
   const changedEntries: IIndexEntry[] = []
   const journalEntryDirs = Object.keys(dir2journalEntries)
@@ -81,8 +80,9 @@ function addChangesForSidecars(entries: IIndexEntry[], changes: IIndexChanges) {
     const name2sidecars = mapName2Sidecars(entries) as Record<string, IIndexEntry[]>
 
     const journalFilenames = dir2journalEntries[dir].map(entry => entry.filename)
+    const journalFilenameSet = new Set(journalFilenames)
 
-    const isPristineFile = filename => !journalFilenames.includes(filename) && !removedFilenames.includes(filename)
+    const isPristineFile = filename => !journalFilenameSet.has(filename) && !removedFilenames.has(filename)
 
     for (const filename of journalFilenames) {
       const sidecars: IIndexEntry[] = getSidecarsByFilename(name2sidecars, filename)
@@ -90,7 +90,7 @@ function addChangesForSidecars(entries: IIndexEntry[], changes: IIndexChanges) {
         return
       }
       sidecars.filter(sidecar => isPristineFile(sidecar.filename)).forEach(sidecar => {
-        const changeType = getChangeType(changes, filename)
+        const changeType = getChangeType(changedFilenames, addedFilenames, filename)
         log.trace(`Add ${fileToString(sidecar)} affected sidecar to journal changes for ${changeType} file ${filename}`)
         changedEntries.push(sidecar)
       })
@@ -116,8 +116,8 @@ function createJournalChange(updatedEntries: IIndexEntry[], changes: IIndexChang
     addChangesForSidecars(updatedEntries, result)
     return result
   }
-  const journalFilenames = [...result.adds, ...result.changes].map(entry => entry.filename)
-  const onlyChecksumChanges = updatedChecksumEntries.filter(entry => !journalFilenames.includes(entry.filename))
+  const journalFilenames = new Set([...result.adds, ...result.changes].map(entry => entry.filename))
+  const onlyChecksumChanges = updatedChecksumEntries.filter(entry => !journalFilenames.has(entry.filename))
   result.changes.push(...onlyChecksumChanges)
   result.changes.sort(byFilename)
   addChangesForSidecars(updatedEntries, result)
@@ -11,6 +11,13 @@ import { TLocalStorageFile, TLocalStorageDir, TStorage, TStorageEntry } from "@h
 
 const log = Logger('plugin.storage')
 
+const ignoreNotFound = (err: any) => {
+  if (err.code != 'ENOENT') {
+    throw err
+  }
+  return false
+}
+
 export class Storage implements TStorage {
   #dir: string
 
@@ -149,8 +156,8 @@ export class Storage implements TStorage {
   async removeFile(entry: TStorageEntry, suffix: string): Promise<any> {
     const { file } = this.#parse(entry, suffix)
     const storageFile = path.resolve(this.#dir, file)
-    return fs.access(storageFile)
-      .then(() => fs.unlink(storageFile), () => false)
+    return fs.unlink(storageFile)
+      .catch(ignoreNotFound)
       .then(() => {
         const metaKey = this.#getMetaKey(suffix)
         if (entry.meta[metaKey]) {
@@ -230,7 +237,7 @@ class LocalStorageFile implements TLocalStorageFile {
 
   async release() {
     if (this.#isTmpFile) {
-      await access(this.file).then(() => unlink(this.file), () => true)
+      await unlink(this.file).catch(ignoreNotFound)
     }
   }
 }
@@ -243,6 +250,6 @@ class LocalStorageDir implements TLocalStorageDir {
   }
 
   async release() {
-    await access(this.dir).then(() => rm(this.dir, {recursive: true}), () => true)
+    await rm(this.dir, {recursive: true, force: true})
   };
 }
\ No newline at end of file
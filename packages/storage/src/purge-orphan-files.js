@@ -7,33 +7,30 @@ const log = Logger('storage.purge');
 
 import { readJsonGzip, promisify, humanizeBytes as humanize } from '@home-gallery/common';
 
-import { getEntryFilesCacheId } from './entry-files-cache-file.js'
-import { getMediaCacheId } from './media-cache-file.js'
+import { getEntryFilesCacheKey, getEntryFilesCacheId } from './entry-files-cache-file.js'
 
 const asyncReadJsonGzip = promisify(readJsonGzip)
 
-const getFiles = (database) => {
-  return database.data.reduce((result, entry) => {
-    result.push(...entry.files)
-    return result
-  }, [])
-}
-
-const getValidIdMapFromDatabase = (database) => {
-  const files = getFiles(database)
-  const fileIds = files.reduce((result, file) => {
-    result[file.id] = true
-    return result
-  }, {})
-  const cacheIds = files.reduce((result, file) => {
-    const cacheId = getEntryFilesCacheId({indexName: file.index, ...file})
-    result[cacheId] = true
-    const mediaCacheId = getMediaCacheId({files: [{indexName: file.index, ...file}]})
-    result[mediaCacheId] = true
-    return result
-  }, {})
+export const getValidIdMapFromDatabase = (database) => {
+  const validIdMap = {}
+  // Entry files cache and media cache share the same per directory key
+  // (see getEntryFilesCacheKey and getMediaCacheKey) and therefore the
+  // same cache id. Hash each key only once
+  const cacheKeys = {}
+  for (const entry of database.data) {
+    for (const file of entry.files) {
+      validIdMap[file.id] = true
+
+      const cacheEntry = {indexName: file.index, filename: file.filename}
+      const cacheKey = getEntryFilesCacheKey(cacheEntry)
+      if (!cacheKeys[cacheKey]) {
+        cacheKeys[cacheKey] = true
+        validIdMap[getEntryFilesCacheId(cacheEntry)] = true
+      }
+    }
+  }
 
-  return {...fileIds, ...cacheIds}
+  return validIdMap
 }
 
 const getValidIdMapFromIndex = (index) => {
@@ -52,7 +49,7 @@ const getAllValidIdMap = async (databaseFilename, indexFilenames) => {
   log.info(t0, `Read database from ${databaseFilename} with ${database.data.length} entries`)
 
   t0 = Date.now()
-  let validIdMap = getValidIdMapFromDatabase(database)
+  const validIdMap = getValidIdMapFromDatabase(database)
   log.debug(t0, `Found ${Object.keys(validIdMap).length} valid storage ids from ${database.data.length} entries`)
 
   if (!indexFilenames?.length) {
@@ -67,7 +64,7 @@ const getAllValidIdMap = async (databaseFilename, indexFilenames) => {
 
     t0 = Date.now()
     const indexValidIdMap = getValidIdMapFromIndex(index)
-    validIdMap = {...validIdMap, ...indexValidIdMap}
+    Object.assign(validIdMap, indexValidIdMap)
     log.debug(t0, `Found ${Object.keys(indexValidIdMap).length} valid storage ids from ${index.data.length} index entries`)
   }
 
@@ -0,0 +1,39 @@
+import t from 'tap'
+
+import { sha1Hex } from '@home-gallery/common'
+
+import { getEntryFilesCacheId } from './entry-files-cache-file.js'
+import { getMediaCacheId } from './media-cache-file.js'
+import { getValidIdMapFromDatabase } from './purge-orphan-files.js'
+
+const database = {
+  data: [
+    {files: [{id: 'a1', index: 'photos', filename: '2023/a.jpg'}, {id: 'a2', index: 'photos', filename: '2023/a.xmp'}]},
+    {files: [{id: 'b1', index: 'photos', filename: '2024/b.jpg'}]},
+    {files: [{id: 'c1', index: 'phone', filename: '2023/c.jpg'}]},
+    {files: [{id: 'c2', index: 'phone', filename: '2023/d.jpg'}]},
+  ]
+}
+
+t.test('getValidIdMapFromDatabase', async t => {
+  t.test('file ids and one cache id per directory', async t => {
+    const validIdMap = getValidIdMapFromDatabase(database)
+
+    t.same(Object.keys(validIdMap).sort(), [
+      'a1', 'a2', 'b1', 'c1', 'c2',
+      sha1Hex('photos:2023'),
+      sha1Hex('photos:2024'),
+      sha1Hex('phone:2023'),
+    ].sort())
+  })
+
+  t.test('contains entry files and media cache ids', async t => {
+    const validIdMap = getValidIdMapFromDatabase(database)
+
+    database.data.forEach(entry => entry.files.forEach(file => {
+      const cacheEntry = {indexName: file.index, filename: file.filename}
+      t.ok(validIdMap[getEntryFilesCacheId(cacheEntry)], `entry files cache id of ${file.filename}`)
+      t.ok(validIdMap[getMediaCacheId({files: [cacheEntry]})], `media cache id of ${file.filename}`)
+    }))
+  })
+})